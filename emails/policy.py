@@ -7,7 +7,8 @@ headers as well.
 
 The main change is to use a custom header_factory, which:
 
-* For each header, adds the UnstructuredHeader variant as .as_unstructured
+* For each header, adds the UnstructuredHeader variant as .as_unstructured,
+  which is parsed on first access
 * Handles non-compliant Message-IDs generated by Microsoft alerts
 
 See:
@@ -20,11 +21,14 @@ https://github.com/python/cpython/blob/main/Lib/email/policy.py
 
 from email._header_value_parser import get_unstructured, InvalidMessageID
 from email.headerregistry import (
+    BaseHeader,
     MessageIDHeader as PythonMessageIDHeader,
     HeaderRegistry as PythonHeaderRegistry,
     UnstructuredHeader,
 )
+from email.parser import BytesParser
 from email.policy import EmailPolicy
+from functools import cached_property
 
 from email import errors
 
@@ -50,32 +54,52 @@ class RelayMessageIDHeader(PythonMessageIDHeader):
     @classmethod
     def parse(cls, value, kwds):
         try:
-            parse_tree = cls.value_parser(value)
+            super().parse(value, kwds)
         except IndexError:
             token = get_unstructured(value)
-            message_id = InvalidMessageID(token)
-            message_id.defects.append(
+            parse_tree = InvalidMessageID(token)
+            parse_tree.defects.append(
                 errors.InvalidHeaderDefect(
                     f"IndexError for invalid msg-id in '{value}'"
                 )
             )
-            parse_tree = message_id
-        kwds["parse_tree"] = parse_tree
-        kwds["decoded"] = str(parse_tree)
-        kwds["defects"].extend(parse_tree.all_defects)
+            kwds["parse_tree"] = parse_tree
+            kwds["decoded"] = str(parse_tree)
+            kwds["defects"].extend(parse_tree.all_defects)
+
+
+class _UnstructuredHeader(UnstructuredHeader, BaseHeader):
+    """The unstructured variant of a header, provided as .as_unstructured"""
+
+
+class _LazyUnstructuredHeader:
+    """Mixin for a header that creates the unstructured header on first access."""
+
+    _unstructured_args: tuple[str, str]
+
+    @cached_property
+    def as_unstructured(self) -> BaseHeader:
+        return _UnstructuredHeader(*self._unstructured_args)
+
+
+class _LazyUnstructuredBaseHeader(_LazyUnstructuredHeader, BaseHeader):
+    """The base class for Relay headers, with .as_unstructured"""
 
 
 class RelayHeaderRegistry(PythonHeaderRegistry):
-    """Extend the HeaderRegistry to store the unstructured header."""
+    """Extend the HeaderRegistry to provide the unstructured header."""
+
+    def __init__(self, default_class=UnstructuredHeader, use_default_map=True) -> None:
+        super().__init__(
+            base_class=_LazyUnstructuredBaseHeader,
+            default_class=default_class,
+            use_default_map=use_default_map,
+        )
 
     def __call__(self, name, value):
-        """Add the unstructured header as .as_unstructured."""
+        """Add the unstructured header as .as_unstructured, parsed on first use."""
         header_instance = super().__call__(name, value)
-        as_unstructured_cls = type(
-            "_UnstructuredHeader", (UnstructuredHeader, self.base_class), {}
-        )
-        as_unstructured = as_unstructured_cls(name, value)
-        header_instance.as_unstructured = as_unstructured
+        header_instance._unstructured_args = (name, value)
         return header_instance
 
 
@@ -85,3 +109,6 @@ relay_header_factory.registry["message-id"] = cast(
 )
 
 relay_policy = EmailPolicy(header_factory=relay_header_factory)
+
+# Parsers create a new FeedParser per message, so one parser can be shared
+relay_bytes_parser = BytesParser(policy=relay_policy)
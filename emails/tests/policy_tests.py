@@ -2,10 +2,11 @@
 
 from email import message_from_string, errors
 from typing_extensions import TypedDict
+import pickle
 
 import pytest
 
-from emails.policy import relay_policy
+from emails.policy import relay_header_factory, relay_policy
 
 from .views_tests import EMAIL_INCOMING
 
@@ -99,3 +100,50 @@ def test_compliant_header_parsing(email_id: str) -> None:
     email = message_from_string(email_in_text, policy=relay_policy)
     for header_name, value in email.items():
         assert len(value.defects) == 0
+
+
+def test_as_unstructured_class_is_reused() -> None:
+    email_in_text = EMAIL_INCOMING["plain_text"]
+    email = message_from_string(email_in_text, policy=relay_policy)
+    unstructured_classes = {type(value.as_unstructured) for value in email.values()}
+    assert len(unstructured_classes) == 1
+
+
+def test_as_unstructured_is_parsed_on_first_access() -> None:
+    email_in_text = EMAIL_INCOMING["plain_text"]
+    email = message_from_string(email_in_text, policy=relay_policy)
+    value = email["From"]
+    assert "as_unstructured" not in value.__dict__
+    as_unstructured = value.as_unstructured
+    assert value.as_unstructured is as_unstructured
+    assert as_unstructured.name == value.name
+
+
+def test_header_name_case_is_preserved() -> None:
+    email = message_from_string(
+        "message-ID: <test@example.com>\nSUBJECT: Hi\n\nBody", policy=relay_policy
+    )
+    message_id = email["Message-ID"]
+    assert message_id.name == "message-ID"
+    assert message_id.as_unstructured.name == "message-ID"
+    assert message_id.fold(policy=relay_policy) == "message-ID: <test@example.com>\n"
+    subject = email["Subject"]
+    assert subject.name == "SUBJECT"
+    assert subject.as_unstructured.name == "SUBJECT"
+
+
+def test_header_can_be_pickled() -> None:
+    header = relay_header_factory("Subject", "Hi")
+    unpickled = pickle.loads(pickle.dumps(header))
+    assert unpickled == header
+    assert unpickled.name == "Subject"
+    assert str(unpickled.as_unstructured) == "Hi"
+
+
+def test_email_can_be_pickled() -> None:
+    email_in_text = EMAIL_INCOMING["plain_text"]
+    email = message_from_string(email_in_text, policy=relay_policy)
+    unpickled = pickle.loads(pickle.dumps(email))
+    assert unpickled.as_string() == email.as_string()
+    for header_name, value in unpickled.items():
+        assert str(value.as_unstructured) == str(email[header_name].as_unstructured)
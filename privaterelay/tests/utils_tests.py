@@ -1,9 +1,11 @@
 from typing import Iterator
 from unittest.mock import patch
 import logging
+import sys
 
 from django.contrib.auth.models import AbstractBaseUser, Group, User
 from django.core.cache.backends.base import BaseCache
+from django.http import Http404, HttpRequest, HttpResponse
 from django.test import RequestFactory
 
 from _pytest.fixtures import SubRequest
@@ -17,6 +19,8 @@ import pytest
 from ..plans import get_premium_country_language_mapping
 from ..utils import (
     AcceptLanguageError,
+    enable_if_setting,
+    enable_or_404,
     flag_is_active_in_task,
     get_countries_info_from_request_and_mapping,
     guess_country_from_accept_lang,
@@ -181,6 +185,14 @@ from ..utils import (
         ("zam, es-MX, es, en-US, en", "MX"),  # Miahuatlán Zapotec
         ("zh-CN, zh, zh-TW, zh-HK, en-US, en", "CN"),  # Chinese (China)
         ("zh-tw, zh, en-us, en", "TW"),  # Chinese (Taiwan)
+        # Other primary languages
+        ("am, en", "ET"),  # Amharic -> Ethiopia
+        ("fil, en-US, en", "PH"),  # Filipino -> Philippines
+        ("fo, da, en", "FO"),  # Faroese -> Faroe Islands
+        ("mn, en", "MN"),  # Mongolian -> Mongolia
+        ("mt, en-GB, en", "MT"),  # Maltese -> Malta
+        ("no, nb, en-US, en", "NO"),  # Norwegian -> Norway
+        ("zu, en-ZA, en", "ZA"),  # Zulu -> South Africa
         # Test cases from RFC 5646, "Tags for Identifying Languages", Appendix A
         # RFC 5646 - Simple language subtag
         ("de", "DE"),  # German -> Germany
@@ -305,6 +317,21 @@ def test_guess_country_from_accept_lang_short_primary_lang_fails(accept_lang) ->
     assert exc_info.value.accept_lang == accept_lang
 
 
+def test_guess_country_from_accept_lang_is_cached() -> None:
+    guess_country_from_accept_lang.cache_clear()
+    assert guess_country_from_accept_lang("en-GB, en-US, en") == "GB"
+    assert guess_country_from_accept_lang("en-GB, en-US, en") == "GB"
+    cache_info = guess_country_from_accept_lang.cache_info()
+    assert cache_info.hits == 1
+    assert cache_info.misses == 1
+
+
+def test_guess_country_from_accept_lang_region_is_interned() -> None:
+    country_code = guess_country_from_accept_lang("de-at")
+    assert country_code == "AT"
+    assert country_code is sys.intern("AT")
+
+
 def test_get_countries_info_bad_accept_language(
     rf: RequestFactory, caplog: LogCaptureFixture
 ) -> None:
@@ -347,6 +374,14 @@ def test_get_countries_info_cdn_language(
     assert getattr(record, "region") == "DE"
 
 
+def test_get_countries_info_cdn_region_is_interned(rf: RequestFactory) -> None:
+    request = rf.get("/api/v1/runtime_data", HTTP_X_CLIENT_REGION="de")
+    mapping = get_premium_country_language_mapping()
+    info = get_countries_info_from_request_and_mapping(request, mapping)
+    assert info["country_code"] == "DE"
+    assert info["country_code"] is sys.intern("DE")
+
+
 def test_get_countries_info_cdn_and_accept_language_uses_cdn(
     rf: RequestFactory, caplog: LogCaptureFixture
 ) -> None:
@@ -393,6 +428,77 @@ def test_get_countries_info_no_language(
     assert getattr(record, "region") == "US"
 
 
+#
+# enable_or_404 tests
+#
+
+
+def _view(request: HttpRequest) -> HttpResponse:
+    """A view to wrap in conditional decorators."""
+    return HttpResponse("Enabled")
+
+
+def test_enable_or_404_enabled(rf: RequestFactory) -> None:
+    view = enable_or_404(lambda: True)(_view)
+    response = view(rf.get("/"))
+    assert response.content == b"Enabled"
+
+
+def test_enable_or_404_disabled(rf: RequestFactory) -> None:
+    view = enable_or_404(lambda: False, "Disabled")(_view)
+    with pytest.raises(Http404) as exc_info:
+        view(rf.get("/"))
+    assert str(exc_info.value) == "Disabled"
+
+
+def test_enable_or_404_checks_on_each_call(rf: RequestFactory) -> None:
+    enabled = [False, True]  # Popped from the end
+    view = enable_or_404(enabled.pop)(_view)
+    assert view(rf.get("/")).content == b"Enabled"
+    with pytest.raises(Http404):
+        view(rf.get("/"))
+
+
+def test_enable_or_404_wraps_view() -> None:
+    view = enable_or_404(lambda: True)(_view)
+    assert view.__name__ == "_view"
+    assert view.__doc__ == "A view to wrap in conditional decorators."
+    assert getattr(view, "__wrapped__") is _view
+
+
+@pytest.mark.parametrize("setting_value", (True, "yes", 1))
+def test_enable_if_setting_truthy(
+    rf: RequestFactory, settings: SettingsWrapper, setting_value: object
+) -> None:
+    settings.TEST_VIEW_ENABLED = setting_value
+    view = enable_if_setting("TEST_VIEW_ENABLED")(_view)
+    assert view(rf.get("/")).content == b"Enabled"
+
+
+@pytest.mark.parametrize("setting_value", (False, "", 0, None))
+def test_enable_if_setting_falsy(
+    rf: RequestFactory, settings: SettingsWrapper, setting_value: object
+) -> None:
+    settings.TEST_VIEW_ENABLED = setting_value
+    view = enable_if_setting("TEST_VIEW_ENABLED")(_view)
+    with pytest.raises(Http404) as exc_info:
+        view(rf.get("/"))
+    assert str(exc_info.value) == (
+        "This view is disabled because TEST_VIEW_ENABLED is False"
+    )
+
+
+def test_enable_if_setting_reads_setting_on_each_call(
+    rf: RequestFactory, settings: SettingsWrapper
+) -> None:
+    settings.TEST_VIEW_ENABLED = True
+    view = enable_if_setting("TEST_VIEW_ENABLED")(_view)
+    assert view(rf.get("/")).content == b"Enabled"
+    settings.TEST_VIEW_ENABLED = False
+    with pytest.raises(Http404):
+        view(rf.get("/"))
+
+
 #
 # flag_is_active_in_task tests
 #
@@ -537,13 +643,13 @@ def test_flag_is_active_for_task_everyone_overrides_user(
 
 def test_flag_is_active_for_task_percent_pass(flag_user: User | None) -> None:
     Flag.objects.create(name=TEST_FLAG_NAME, percent=50.0)
-    with patch("privaterelay.utils.random.uniform", return_value=49.0):
+    with patch("privaterelay.utils.random", return_value=0.49):
         assert flag_is_active_in_task(TEST_FLAG_NAME, flag_user)
 
 
 def test_flag_is_active_for_task_percent_fail(flag_user: User | None) -> None:
     Flag.objects.create(name=TEST_FLAG_NAME, percent=50.0)
-    with patch("privaterelay.utils.random.uniform", return_value=50.1):
+    with patch("privaterelay.utils.random", return_value=0.501):
         assert not flag_is_active_in_task(TEST_FLAG_NAME, flag_user)
 
 
@@ -1,12 +1,14 @@
-from decimal import Decimal
-from functools import wraps
-from string import ascii_uppercase
-from typing import Callable, TypedDict, cast
+from functools import lru_cache, partial, wraps
+from random import random
+from typing import Any, Callable, TypedDict, cast
 import logging
-import random
+import re
+import sys
 
 from django.conf import settings
 from django.contrib.auth.models import AbstractBaseUser
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.http import Http404, HttpRequest
 from django.utils.translation.trans_real import parse_accept_lang_header
 
@@ -39,26 +41,23 @@ def get_countries_info_from_request_and_mapping(
     request: HttpRequest, mapping: PlanCountryLangMapping
 ) -> CountryInfo:
     country_code = _get_cc_from_request(request)
-    countries = sorted(mapping.keys())
-    available_in_country = country_code in countries
-    return {
-        "country_code": country_code,
-        "countries": countries,
-        "available_in_country": available_in_country,
-        "plan_country_lang_mapping": mapping,
-    }
+    return _get_countries_info(country_code, mapping)
 
 
 def get_countries_info_from_lang_and_mapping(
     accept_lang: str, mapping: PlanCountryLangMapping
 ) -> CountryInfo:
     country_code = _get_cc_from_lang(accept_lang)
-    countries = sorted(mapping.keys())
-    available_in_country = country_code in countries
+    return _get_countries_info(country_code, mapping)
+
+
+def _get_countries_info(
+    country_code: str, mapping: PlanCountryLangMapping
+) -> CountryInfo:
     return {
         "country_code": country_code,
-        "countries": countries,
-        "available_in_country": available_in_country,
+        "countries": sorted(mapping),
+        "available_in_country": country_code in mapping,
         "plan_country_lang_mapping": mapping,
     }
 
@@ -68,7 +67,7 @@ def get_subplat_upgrade_link_by_language(
 ) -> str:
     country_str = guess_country_from_accept_lang(accept_language)
     country = cast(CountryStr, country_str)
-    language_str = accept_language.split("-")[0].lower()
+    language_str = accept_language.partition("-")[0].lower()
     language = cast(LanguageStr, language_str)
     country_lang_mapping = get_premium_country_language_mapping()
     country_details = country_lang_mapping.get(country, country_lang_mapping["US"])
@@ -86,15 +85,15 @@ def _get_cc_from_request(request: HttpRequest) -> str:
     log_data: dict[str, str] = {}
     cdn_region = None
     region = None
-    if "X-Client-Region" in request.headers:
-        cdn_region = region = request.headers["X-Client-Region"].upper()
+    if (cdn_region_raw := request.headers.get("X-Client-Region")) is not None:
+        cdn_region = region = sys.intern(cdn_region_raw.upper())
         log_data["cdn_region"] = cdn_region
         log_data["region_method"] = "cdn"
 
     accept_language_region = None
-    if "Accept-Language" in request.headers:
-        log_data["accept_lang"] = request.headers["Accept-Language"]
-        accept_language_region = _get_cc_from_lang(request.headers["Accept-Language"])
+    if (accept_lang := request.headers.get("Accept-Language")) is not None:
+        log_data["accept_lang"] = accept_lang
+        accept_language_region = _get_cc_from_lang(accept_lang)
         log_data["accept_lang_region"] = accept_language_region
         if region is None:
             region = accept_language_region
@@ -129,6 +128,7 @@ _PRIMARY_LANGUAGE_TO_COUNTRY = {
     "ace": "ID",  # # Acehnese -> Indonesia
     "ach": "UG",  # Acholi -> Uganda
     "af": "ZA",  # Afrikaans -> South Africa
+    "am": "ET",  # Amharic -> Ethiopia
     "an": "ES",  # Aragonese -> Spain
     "ar": "EG",  # Arabic -> Egypt
     "arn": "CL",  # Mapudungun -> Chile
@@ -144,6 +144,7 @@ _PRIMARY_LANGUAGE_TO_COUNTRY = {
     "bs": "BA",  # Bosnian -> Bosnia and Herzegovina
     "ca": "FR",  # Catalan -> France
     "cak": "MX",  # Kaqchikel -> Mexico
+    "ceb": "PH",  # Cebuano -> Philippines
     "ckb": "IQ",  # Central Kurdish -> Iraq
     "cs": "CZ",  # Czech -> Czech Republic
     "cv": "RU",  # Chuvash -> Russia
@@ -151,8 +152,10 @@ _PRIMARY_LANGUAGE_TO_COUNTRY = {
     "da": "DK",  # Danish -> Denmark
     "de": "DE",  # German -> Germany
     "dsb": "DE",  # Lower Sorbian -> Germany
+    "dv": "MV",  # Divehi -> Maldives
+    "dz": "BT",  # Dzongkha -> Bhutan
     "el": "GR",  # Greek -> Greece
-    "en": "US",  # English -> Canada
+    "en": "US",  # English -> United States
     "eo": "SM",  # Esperanto -> San Marino
     "es": "ES",  # Spanish -> Spain (instead of Mexico, top by population)
     "et": "EE",  # Estonian -> Estonia
@@ -160,6 +163,8 @@ _PRIMARY_LANGUAGE_TO_COUNTRY = {
     "fa": "IR",  # Persian -> Iran
     "ff": "SN",  # Fulah -> Senegal
     "fi": "FI",  # Finnish -> Finland
+    "fil": "PH",  # Filipino -> Philippines
+    "fo": "FO",  # Faroese -> Faroe Islands
     "fr": "FR",  # French -> France
     "frp": "FR",  # Arpitan -> France
     "fur": "IT",  # Friulian -> Italy
@@ -170,6 +175,8 @@ _PRIMARY_LANGUAGE_TO_COUNTRY = {
     "gn": "PY",  # Guarani -> Paraguay
     "gu": "IN",  # Gujarati -> India
     "gv": "IM",  # Manx -> Isle of Man
+    "ha": "NG",  # Hausa -> Nigeria
+    "haw": "US",  # Hawaiian -> United States
     "he": "IL",  # Hebrew -> Israel
     "hi": "IN",  # Hindi -> India
     "hr": "HR",  # Croatian -> Croatia
@@ -179,19 +186,24 @@ _PRIMARY_LANGUAGE_TO_COUNTRY = {
     "hye": "AM",  # Armenian Eastern Classic Orthography -> Armenia
     "ia": "FR",  # Interlingua -> France
     "id": "ID",  # Indonesian -> Indonesia
+    "ig": "NG",  # Igbo -> Nigeria
     "ilo": "PH",  # Iloko -> Philippines
     "is": "IS",  # Icelandic -> Iceland
     "it": "IT",  # Italian -> Italy
     "ixl": "MX",  # Ixil -> Mexico
     "ja": "JP",  # Japanese -> Japan
     "jiv": "MX",  # Shuar -> Mexico
+    "jv": "ID",  # Javanese -> Indonesia
     "ka": "GE",  # Georgian -> Georgia
     "kab": "DZ",  # Kayble -> Algeria
     "kk": "KZ",  # Kazakh -> Kazakhstan
+    "kl": "GL",  # Kalaallisut -> Greenland
     "km": "KH",  # Khmer -> Cambodia
     "kn": "IN",  # Kannada -> India
     "ko": "KR",  # Korean -> South Korea
     "ks": "IN",  # Kashmiri -> India
+    "ku": "TR",  # Kurdish -> Turkey
+    "ky": "KG",  # Kyrgyz -> Kyrgyzstan
     "lb": "LU",  # Luxembourgish -> Luxembourg
     "lg": "UG",  # Luganda -> Uganda
     "lij": "IT",  # Ligurian -> Italy
@@ -202,16 +214,21 @@ _PRIMARY_LANGUAGE_TO_COUNTRY = {
     "lv": "LV",  # Latvian -> Latvia
     "mai": "IN",  # Maithili -> India
     "meh": "MX",  # Mixteco Yucuhiti -> Mexico
+    "mg": "MG",  # Malagasy -> Madagascar
+    "mi": "NZ",  # Māori -> New Zealand
     "mix": "MX",  # Mixtepec Mixtec -> Mexico
     "mk": "MK",  # Macedonian -> North Macedonia
     "ml": "IN",  # Malayalam -> India
+    "mn": "MN",  # Mongolian -> Mongolia
     "mr": "IN",  # Marathi -> India
     "ms": "MY",  # Malay -> Malaysia
+    "mt": "MT",  # Maltese -> Malta
     "my": "MM",  # Burmese -> Myanmar
     "nb": "NO",  # Norwegian Bokmål -> Norway
     "ne": "NP",  # Nepali -> Nepal
     "nl": "NL",  # Dutch -> Netherlands
     "nn": "NO",  # Norwegian Nynorsk -> Norway
+    "no": "NO",  # Norwegian -> Norway
     "oc": "FR",  # Occitan -> France
     "or": "IN",  # Odia -> India
     "pa": "IN",  # Punjabi -> India
@@ -222,6 +239,7 @@ _PRIMARY_LANGUAGE_TO_COUNTRY = {
     "rm": "CH",  # Romansh -> Switzerland
     "ro": "RO",  # Romanian -> Romania
     "ru": "RU",  # Russian -> Russia
+    "rw": "RW",  # Kinyarwanda -> Rwanda
     "sat": "IN",  # Santali (Ol Chiki) -> India
     "sc": "IT",  # Sardinian -> Italy
     "scn": "IT",  # Sicilian -> Italy
@@ -230,9 +248,12 @@ _PRIMARY_LANGUAGE_TO_COUNTRY = {
     "sk": "SK",  # Slovak -> Slovakia
     "skr": "PK",  # Saraiki -> Pakistan
     "sl": "SI",  # Slovenian -> Slovenia
+    "sm": "WS",  # Samoan -> Samoa
+    "so": "SO",  # Somali -> Somalia
     "son": "ML",  # Songhay -> Mali
     "sq": "AL",  # Albanian -> Albania
     "sr": "RS",  # Serbian -> Serbia
+    "su": "ID",  # Sundanese -> Indonesia
     "sv": "SE",  # Swedish -> Sweeden
     "sw": "TZ",  # Swahili -> Tanzania
     "szl": "PL",  # Silesian -> Poland
@@ -240,9 +261,13 @@ _PRIMARY_LANGUAGE_TO_COUNTRY = {
     "te": "IN",  # Telugu -> India
     "tg": "TJ",  # Tajik -> Tajikistan
     "th": "TH",  # Thai -> Thailand
+    "tk": "TM",  # Turkmen -> Turkmenistan
     "tl": "PH",  # Tagalog -> Philippines
+    "to": "TO",  # Tongan -> Tonga
     "tr": "TR",  # Turkish or Crimean Tatar -> Turkey
     "trs": "MX",  # Triqui -> Mexico
+    "tt": "RU",  # Tatar -> Russia
+    "ug": "CN",  # Uyghur -> China
     "uk": "UA",  # Ukrainian -> Ukraine
     "ur": "PK",  # Urdu -> Pakistan
     "uz": "UZ",  # Uzbek -> Uzbekistan
@@ -250,8 +275,10 @@ _PRIMARY_LANGUAGE_TO_COUNTRY = {
     "wo": "SN",  # Wolof -> Senegal
     "xcl": "AM",  # Armenian Classic -> Armenia
     "xh": "ZA",  # Xhosa -> South Africa
+    "yo": "NG",  # Yoruba -> Nigeria
     "zam": "MX",  # Miahuatlán Zapotec -> Mexico
     "zh": "CN",  # Chinese -> China
+    "zu": "ZA",  # Zulu -> South Africa
 }
 
 # Special cases for language tags
@@ -268,6 +295,11 @@ _LANGUAGE_TAG_TO_COUNTRY_OVERRIDE = {
 }
 
 
+# A two-letter region subtag that is a non-private ISO 3166 country code
+# RFC 5646 2.2.4 "Region Subtag" point 6, reserved subtags AA, QM-QZ, XA-XZ, ZZ
+_COUNTRY_REGION_SUBTAG_RE = re.compile(r"(?!AA|Q[M-Z]|X|ZZ)[A-Z]{2}")
+
+
 class AcceptLanguageError(ValueError):
     """There was an issue processing the Accept-Language header."""
 
@@ -276,6 +308,7 @@ class AcceptLanguageError(ValueError):
         self.accept_lang = accept_lang
 
 
+@lru_cache(maxsize=1000)
 def guess_country_from_accept_lang(accept_lang: str) -> str:
     """
     Guess the user's country from the Accept-Language header
@@ -284,6 +317,8 @@ def guess_country_from_accept_lang(accept_lang: str) -> str:
 
     If an issue is detected, a AcceptLanguageError is raised.
 
+    Results are cached, since most requests send one of a few common headers.
+
     The header may come directly from a web request, or may be the header
     captured by Mozilla Accounts (FxA) at signup.
 
@@ -298,8 +333,8 @@ def guess_country_from_accept_lang(accept_lang: str) -> str:
         raise AcceptLanguageError("Invalid Accept-Language string", accept_lang)
     top_lang_tag = lang_q_pairs[0][0]
 
-    subtags = top_lang_tag.split("-")
-    lang = subtags[0].lower()
+    primary_subtag, _, other_subtags = top_lang_tag.partition("-")
+    lang = primary_subtag.lower()
     if lang == "i":
         raise AcceptLanguageError("Irregular language tag", accept_lang)
     if lang == "x":
@@ -313,7 +348,7 @@ def guess_country_from_accept_lang(accept_lang: str) -> str:
             "Private-use language tag (RFC 5646 2.2.1)", accept_lang
         )
 
-    for maybe_region_raw in subtags[1:]:
+    for maybe_region_raw in other_subtags.split("-") if other_subtags else ():
         maybe_region = maybe_region_raw.upper()
 
         # Look for a special case
@@ -323,18 +358,9 @@ def guess_country_from_accept_lang(accept_lang: str) -> str:
         if len(maybe_region) <= 1:
             # One-character extension or empty, stop processing
             break
-        if (
-            len(maybe_region) == 2
-            and all(c in ascii_uppercase for c in maybe_region)
-            and
-            # RFC 5646 2.2.4 "Region Subtag" point 6, reserved subtags
-            maybe_region != "AA"
-            and maybe_region != "ZZ"
-            and maybe_region[0] != "X"
-            and (maybe_region[0] != "Q" or maybe_region[1] < "M")
-        ):
+        if _COUNTRY_REGION_SUBTAG_RE.fullmatch(maybe_region):
             # Subtag is a non-private ISO 3166 country code
-            return maybe_region
+            return sys.intern(maybe_region)
 
         # Subtag is probably a script, like "Hans" in "zh-Hans-CN"
         # Loop to the next subtag, which might be a ISO 3166 country code
@@ -347,12 +373,12 @@ def guess_country_from_accept_lang(accept_lang: str) -> str:
 
 
 def enable_or_404(
-    check_function: Callable[[], bool],
+    check_function: Callable[[], object],
     message: str = "This conditional view is disabled.",
 ):
     """
-    Returns decorator that enables a view if a check function passes,
-    otherwise returns a 404.
+    Returns decorator that enables a view if a check function returns a truthy
+    value, otherwise returns a 404.
 
     Usage:
 
@@ -404,12 +430,27 @@ def enable_if_setting(
 
     """
 
-    def setting_is_truthy() -> bool:
-        return bool(getattr(settings, setting_name))
+    # The setting is read on each call, so that it can be overridden in tests
+    read_setting = partial(getattr, settings, setting_name)
+    return enable_or_404(read_setting, message_fmt.format(setting_name=setting_name))
+
+
+@lru_cache(maxsize=None)
+def _get_waffle_flag_model():
+    return get_waffle_flag_model()
+
+
+@lru_cache(maxsize=None)
+def _get_waffle_setting(name: str) -> Any:
+    return get_waffle_setting(name)
+
 
-    return enable_or_404(
-        setting_is_truthy, message_fmt.format(setting_name=setting_name)
-    )
+@receiver(setting_changed)
+def _clear_waffle_setting_caches(setting: str, **kwargs: Any) -> None:
+    """Clear the cached waffle model and settings when a setting is overridden."""
+    if setting.startswith("WAFFLE_"):
+        _get_waffle_flag_model.cache_clear()
+        _get_waffle_setting.cache_clear()
 
 
 def flag_is_active_in_task(flag_name: str, user: AbstractBaseUser | None) -> bool:
@@ -433,26 +474,27 @@ def flag_is_active_in_task(flag_name: str, user: AbstractBaseUser | None) -> boo
     When using this function, use the @override_flag decorator in tests, rather
     than manually creating flags in the database.
     """
-    flag = get_waffle_flag_model().get(flag_name)
+    flag = _get_waffle_flag_model().get(flag_name)
     if not flag.pk:
-        log_level = get_waffle_setting("LOG_MISSING_FLAGS")
+        log_level = _get_waffle_setting("LOG_MISSING_FLAGS")
         if log_level:
             waffle_logger.log(log_level, "Flag %s not found", flag_name)
-        if get_waffle_setting("CREATE_MISSING_FLAGS"):
-            flag, _created = get_waffle_flag_model().objects.get_or_create(
+        if _get_waffle_setting("CREATE_MISSING_FLAGS"):
+            flag, _created = _get_waffle_flag_model().objects.get_or_create(
                 name=flag_name,
-                defaults={"everyone": get_waffle_setting("FLAG_DEFAULT")},
+                defaults={"everyone": _get_waffle_setting("FLAG_DEFAULT")},
             )
             cache = get_waffle_cache()
             cache.set(flag._cache_key(flag.name), flag)
 
-        return bool(get_waffle_setting("FLAG_DEFAULT"))
+        return bool(_get_waffle_setting("FLAG_DEFAULT"))
 
     # Removed - check for override as request query parameter
 
-    if flag.everyone:
+    everyone = flag.everyone
+    if everyone:
         return True
-    elif flag.everyone is False:
+    elif everyone is False:
         return False
 
     # Removed - check for testing override in request query or cookie
@@ -463,12 +505,13 @@ def flag_is_active_in_task(flag_name: str, user: AbstractBaseUser | None) -> boo
         if active_for_user is not None:
             return bool(active_for_user)
 
-    if flag.percent and flag.percent > 0:
+    percent = flag.percent
+    if percent and percent > 0:
         # Removed - check for waffles attribute of request
         # Removed - check for cookie setting for flag
         # Removed - check for read-only mode
 
-        if Decimal(str(random.uniform(0, 100))) <= flag.percent:
+        if random() * 100 <= float(percent):
             # Removed - setting the flag for future checks
             return True
 